@@ -16,7 +16,7 @@ CREATE TABLE sensor_data (
 
 -- 2. air_korea_data(에어코리아 데이터 테이블)
 CREATE TABLE air_korea_data (
-    timestamp DATETIME, 
+    timestamp DATETIME NOT NULL PRIMARY KEY,
     pm10_ug_m3_ DECIMAL(8,3),
     pm2_5_ug_m3_ DECIMAL(8,3),
     pm10_category INT,
@@ -32,5 +32,6 @@ CREATE TABLE environmental_scores (
 	sensor_id BIGINT NOT NULL,  
     environmental_score DECIMAL(5,2) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_created_at (created_at)
+    INDEX idx_created_at (created_at),
+    INDEX idx_sensor_id (sensor_id)
 );
\ No newline at end of file
@@ -0,0 +1,248 @@
+# 센서 실시간(스트리밍) 통계 모듈
+# 업로드 경로에서 값을 하나씩 받아 장치별/항목별 통계를 O(1) 메모리로 갱신한다.
+# DB를 다시 조회하지 않고 EWMA, 최근 구간 평균/최소/최대, 근사 백분위를 바로 제공.
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# ===================== 설정 =====================
+EWMA_ALPHA = 0.3          # 제어용(빠른) EWMA 계수
+EWMA_SLOW_ALPHA = 0.05    # 추세 비교용(느린) EWMA 계수
+WINDOW_SIZE = 60          # 최근 구간 샘플 수
+QUANTILES = (0.5, 0.9, 0.99)
+TREND_EPS = 0.02          # 느린 EWMA 대비 2% 이상 차이나면 상승/하락으로 판단
+
+METRICS = ("temperature", "humidity", "co2eq", "tvoc", "pm1_0", "pm2_5", "pm10")
+DEFAULT_DEVICE = "default"
+MAX_DEVICES = 32          # 장치 수 상한, 넘으면 가장 오래 업로드 없는 장치부터 제거(LRU)
+DEVICE_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,32}$")
+
+
+def _round(v, nd=3):
+    return round(v, nd) if v is not None else None
+
+
+def valid_device_id(device_id):
+    return isinstance(device_id, str) and bool(DEVICE_ID_RE.match(device_id))
+
+
+class P2Quantile:
+    """
+    P² 알고리즘(Jain & Chlamtac)으로 분위수 근사.
+    값을 저장하지 않고 마커 5개만 유지한다.
+    """
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.q = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        self.count += 1
+        if self.count <= 5:
+            self.q.append(x)
+            self.q.sort()
+            return
+
+        q, n = self.q, self.n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while k < 3 and x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+
+        for i in range(1, 4):
+            d = self.np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = self._parabolic(i, d)
+                if not (q[i - 1] < qp < q[i + 1]):
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.q, self.n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return self.q[int(round(self.p * (len(self.q) - 1)))]
+        return self.q[2]
+
+
+class MetricStats:
+    """항목 하나(pm2_5 등)의 스트리밍 통계"""
+    def __init__(self, window_size=WINDOW_SIZE):
+        self.count = 0
+        self.last = None
+        self.updated_at = None
+        self.ewma = None
+        self.ewma_slow = None
+        # 최근 구간(window_size개): 값 큐 + 단조 큐(최소/최대) + 누적합
+        self.window = deque(maxlen=window_size)
+        self._win_sum = 0.0
+        self._min_q = deque()
+        self._max_q = deque()
+        # 백분위는 최근 구간이 아니라 프로세스 시작 이후 전체 값 기준(P²는 값 제거 불가)
+        self.quantiles = {p: P2Quantile(p) for p in QUANTILES}
+
+    def add(self, value, ts=None):
+        value = float(value)
+        seq = self.count
+        self.count += 1
+        self.last = value
+        self.updated_at = ts or datetime.utcnow()
+
+        if self.ewma is None:
+            self.ewma = self.ewma_slow = value
+        else:
+            self.ewma += EWMA_ALPHA * (value - self.ewma)
+            self.ewma_slow += EWMA_SLOW_ALPHA * (value - self.ewma_slow)
+
+        # 구간이 꽉 찼으면 가장 오래된 값 제거
+        if len(self.window) == self.window.maxlen:
+            self._win_sum -= self.window[0]
+        self.window.append(value)
+        self._win_sum += value
+
+        oldest = seq - len(self.window) + 1
+        while self._min_q and self._min_q[-1][1] >= value:
+            self._min_q.pop()
+        self._min_q.append((seq, value))
+        while self._min_q[0][0] < oldest:
+            self._min_q.popleft()
+        while self._max_q and self._max_q[-1][1] <= value:
+            self._max_q.pop()
+        self._max_q.append((seq, value))
+        while self._max_q[0][0] < oldest:
+            self._max_q.popleft()
+
+        for est in self.quantiles.values():
+            est.add(value)
+
+    def trend(self):
+        if self.ewma is None:
+            return None
+        delta = self.ewma - self.ewma_slow
+        eps = TREND_EPS * max(abs(self.ewma_slow), 1.0)
+        if delta > eps:
+            direction = "up"
+        elif delta < -eps:
+            direction = "down"
+        else:
+            direction = "flat"
+        return {"delta": round(delta, 3), "direction": direction}
+
+    def to_dict(self):
+        n = len(self.window)
+        return {
+            "count": self.count,
+            "last": self.last,
+            "ewma": _round(self.ewma),
+            "window": {
+                "size": n,
+                "mean": _round(self._win_sum / n) if n else None,
+                "min": self._min_q[0][1] if self._min_q else None,
+                "max": self._max_q[0][1] if self._max_q else None,
+            },
+            "lifetime_percentiles": {
+                f"p{int(p * 100)}": _round(est.value()) for p, est in self.quantiles.items()
+            },
+            "trend": self.trend(),
+            "updated_at": self.updated_at,
+        }
+
+
+class LiveStatsEngine:
+    """장치별/항목별 MetricStats 묶음 (스레드 안전)"""
+    def __init__(self, metrics=METRICS, clock=time.monotonic):
+        self.metrics = metrics
+        self._devices = OrderedDict()  # 최근 업로드 순(LRU)
+        self._last_seen = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def ingest(self, values, device_id=None, ts=None):
+        """
+        values: {"pm2_5": 12.0, ...} — None/숫자 아닌 값은 건너뜀
+        반환: 장치 수 상한으로 제거된 장치 id (없으면 None)
+        """
+        device_id = device_id or DEFAULT_DEVICE
+        # 먼저 전부 변환 -> 중간에 실패해도 일부 항목만 갱신되는 일 없음
+        clean = []
+        for name in self.metrics:
+            try:
+                v = float(values.get(name))
+            except (TypeError, ValueError):
+                continue
+            if math.isfinite(v):
+                clean.append((name, v))
+
+        evicted = None
+        with self._lock:
+            dev = self._devices.get(device_id)
+            if dev is None:
+                if len(self._devices) >= MAX_DEVICES:
+                    evicted, _ = self._devices.popitem(last=False)
+                    self._last_seen.pop(evicted, None)
+                dev = self._devices[device_id] = {}
+            self._devices.move_to_end(device_id)
+            self._last_seen[device_id] = self._clock()
+            for name, v in clean:
+                stats = dev.get(name)
+                if stats is None:
+                    stats = dev[name] = MetricStats()
+                stats.add(v, ts)
+        return evicted
+
+    def active_devices(self, ttl):
+        """최근 ttl초 안에 업로드한 장치 id 목록"""
+        with self._lock:
+            now = self._clock()
+            return [d for d, seen in self._last_seen.items() if now - seen <= ttl]
+
+    def smoothed(self, device_id, name):
+        """제어용 EWMA 값 (없으면 None)"""
+        with self._lock:
+            stats = self._devices.get(device_id or DEFAULT_DEVICE, {}).get(name)
+            return stats.ewma if stats is not None else None
+
+    def snapshot(self, device_id=None, metric=None):
+        """
+        device_id가 없으면 전체 장치, metric이 있으면 해당 항목만.
+        반환: {device_id: {metric: stats_dict}}
+        """
+        with self._lock:
+            if device_id is not None:
+                targets = {device_id: self._devices.get(device_id, {})}
+            else:
+                targets = self._devices
+            result = {}
+            for dev_id, dev in targets.items():
+                result[dev_id] = {
+                    name: stats.to_dict()
+                    for name, stats in dev.items()
+                    if metric is None or name == metric
+                }
+            return result
@@ -0,0 +1,25 @@
+-- 기존 DB 마이그레이션: air_korea_data PK 추가 + 조회/조인용 인덱스
+-- (aircleanerDB.sql 로 새로 만든 DB에는 이미 반영되어 있음)
+-- ※ 정확히 한 번만 실행할 것. 재실행하면 ADD PRIMARY KEY / ADD INDEX 에서 실패함
+--   (적용 여부: SHOW INDEX FROM air_korea_data WHERE Key_name = 'PRIMARY';
+--    미적용 상태면 app.py 시작 시 init_db() -> require_primary_key 에서 오류 발생)
+-- ※ 기존(이전 버전) 서버는 멈춘 상태에서 실행 권장
+--   (1번 DELETE 이후 같은 시각 행이 새로 들어오면 ADD PRIMARY KEY 가 실패함 -> 데이터 손실은 없음, 다시 실행)
+USE environmental_monitoring;
+
+-- 1. air_korea_data: 테이블 교체 없이 제자리에서 timestamp 중복 제거 후 PRIMARY KEY 추가
+--    (upsert의 ON DUPLICATE KEY 기준)
+--    임시 번호(tmp_id)가 가장 작은 행을 남김
+--    (PK 없는 InnoDB 테이블은 내부 row id 순으로 번호가 매겨짐 = 보통 먼저 저장된 행)
+--    중간에 실패해 tmp_id 가 남아 있으면: ALTER TABLE air_korea_data DROP COLUMN tmp_id; 후 다시 실행
+ALTER TABLE air_korea_data ADD COLUMN tmp_id BIGINT NOT NULL AUTO_INCREMENT UNIQUE;
+DELETE a FROM air_korea_data a
+    JOIN air_korea_data b ON a.timestamp = b.timestamp AND a.tmp_id > b.tmp_id;
+DELETE FROM air_korea_data WHERE timestamp IS NULL;
+ALTER TABLE air_korea_data
+    DROP COLUMN tmp_id,
+    MODIFY timestamp DATETIME NOT NULL,
+    ADD PRIMARY KEY (timestamp);
+
+-- 2. environmental_scores: sensor_id 조인(대시보드 s.scores) 인덱스
+ALTER TABLE environmental_scores ADD INDEX idx_sensor_id (sensor_id);
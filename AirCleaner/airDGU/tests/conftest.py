@@ -0,0 +1,24 @@
+# 테스트 공통 설정: airDGU 모듈 import 경로 + 로컬 SQLite(in-memory) 사용
+import os
+import sys
+import types
+
+import pytest
+
+AIRDGU_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AIRDGU_DIR)
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+# naomkey.py(API 키)는 저장소에 없음 -> 테스트용 값
+try:
+    import naomkey  # noqa: F401
+except ImportError:
+    sys.modules["naomkey"] = types.SimpleNamespace(DONGUK_KEY="test-key")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _init_db():
+    # 서버 시작(__main__)과 동일하게 스키마 생성 + PK 확인
+    import app
+    app.init_db()
@@ -0,0 +1,108 @@
+import pytest
+
+import app as airdgu
+from live_stats import LiveStatsEngine
+
+
+class Purifier:
+    """send_donguk_speed 대체: 전송 기록 + 테스트용 시계"""
+    def __init__(self):
+        self.sent = []
+        self.now = 0.0
+        self.ok = True
+
+    def send(self, speed):
+        self.sent.append(speed)
+        return {"ok": self.ok, "status": 200 if self.ok else None, "text": "x"}
+
+
+@pytest.fixture
+def purifier(monkeypatch):
+    p = Purifier()
+    monkeypatch.setattr(airdgu, "send_donguk_speed", p.send)
+    monkeypatch.setattr(airdgu, "live_stats", LiveStatsEngine(clock=lambda: p.now))
+    monkeypatch.setattr(airdgu, "_control_state", {"devices": {}, "speed": None})
+    return p
+
+
+def _feed(device_id, pm2_5, pm10=10):
+    airdgu.live_stats.ingest({"pm2_5": pm2_5, "pm10": pm10}, device_id)
+    return airdgu.control_device_speed(device_id)
+
+
+def test_hysteresis_grade():
+    # 보통(2) 상태에서 경계 35 근처는 유지
+    assert airdgu.hysteresis_grade(36, airdgu.PM25_BOUNDS, 2, 2.0) == 2
+    assert airdgu.hysteresis_grade(37.5, airdgu.PM25_BOUNDS, 2, 2.0) == 3
+    assert airdgu.hysteresis_grade(34, airdgu.PM25_BOUNDS, 3, 2.0) == 3
+    assert airdgu.hysteresis_grade(32.9, airdgu.PM25_BOUNDS, 3, 2.0) == 2
+    assert airdgu.hysteresis_grade(36, airdgu.PM25_BOUNDS, None, 2.0) == 3
+
+
+def test_speed_sent_only_on_change(purifier):
+    score, speed, result = _feed("dev", 20)
+    assert (score, speed) == (2, 1) and result["ok"]
+    for _ in range(5):
+        _, speed, result = _feed("dev", 20)
+        assert result is None and speed == 1
+    assert purifier.sent == [1]
+
+
+def test_no_flapping_near_boundary(purifier):
+    for _ in range(30):
+        _feed("dev", 34)
+    # EWMA가 35 경계를 오가도 등급이 바뀌지 않음
+    for v in [36, 34, 36.5, 33.5, 36, 34] * 5:
+        _feed("dev", v)
+    assert purifier.sent == [1]
+
+
+def test_failed_send_is_retried(purifier):
+    purifier.ok = False
+    _, speed, _ = _feed("dev", 20)
+    assert speed is None  # 실제 팬 속도 불명
+    purifier.ok = True
+    _, speed, _ = _feed("dev", 20)
+    assert purifier.sent == [1, 1] and speed == 1
+
+
+def test_devices_share_one_purifier(purifier):
+    _feed("a", 20)             # a: 보통 -> 1
+    _feed("b", 80)             # b: 매우 나쁨 -> 3
+    for _ in range(3):
+        _, speed, result = _feed("a", 20)
+        assert speed == 3 and result is None  # 가장 나쁜 장치 기준 유지
+    assert purifier.sent == [1, 3]
+
+    # b가 TTL 동안 업로드 없으면 제외 -> a 기준으로 내려감
+    purifier.now = airdgu.CONTROL_DEVICE_TTL + 1
+    _, speed, _ = _feed("a", 20)
+    assert speed == 1 and purifier.sent == [1, 3, 1]
+
+
+def test_manual_speed_updates_cache(purifier):
+    _feed("dev", 20)
+    client = airdgu.app.test_client()
+    assert client.post("/api/device/speed", json={"speed": 0}).status_code == 200
+    assert airdgu._control_state["speed"] == 0
+    _, speed, result = _feed("dev", 20)
+    assert result["ok"] and speed == 1
+    assert purifier.sent == [1, 0, 1]
+
+
+def test_live_endpoint_serves_control_state(purifier):
+    for _ in range(30):
+        _feed("dev", 34)
+    for v in [36, 36, 36]:
+        score, speed, _ = _feed("dev", v)
+    client = airdgu.app.test_client()
+    control = client.get("/api/stats/live").get_json()["control"]
+    assert control["score"] == score == 2
+    assert control["speed"] == speed == 1
+    assert control["devices"] == {"dev": {"pm2_5": 2, "pm10": 1}}
+
+
+def test_upload_rejects_bad_device_id(purifier):
+    client = airdgu.app.test_client()
+    resp = client.post("/upload", json={"sensor_data": "20,40,400,0.1,10,20", "device_id": "x" * 40})
+    assert resp.status_code == 400
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+import live_stats
+from live_stats import LiveStatsEngine, MetricStats, P2Quantile, valid_device_id
+
+
+def test_p2_first_five_samples_exact():
+    est = P2Quantile(0.5)
+    assert est.value() is None
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    for i, x in enumerate(samples, start=1):
+        est.add(x)
+        seen = sorted(samples[:i])
+        assert est.value() == seen[int(round(0.5 * (i - 1)))]
+    assert est.q == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("p", [0.5, 0.9, 0.99])
+def test_p2_close_to_sorted(p):
+    rnd = random.Random(1)
+    xs = [rnd.gauss(30, 5) for _ in range(20000)]
+    est = P2Quantile(p)
+    for x in xs:
+        est.add(x)
+    exact = sorted(xs)[int(p * (len(xs) - 1))]
+    assert est.value() == pytest.approx(exact, abs=0.5)
+
+
+def test_window_matches_brute_force():
+    rnd = random.Random(2)
+    stats = MetricStats(window_size=10)
+    seen = []
+    # 단조 큐 pop/순번 기반 제거가 모두 일어나도록 반복값/증가/감소 구간 포함
+    xs = [rnd.choice([1, 2, 3, 3, 5]) for _ in range(50)] + list(range(30)) + list(range(30, 0, -1))
+    for x in xs:
+        stats.add(x)
+        seen.append(float(x))
+        win = seen[-10:]
+        d = stats.to_dict()["window"]
+        assert d["size"] == len(win)
+        assert d["min"] == min(win)
+        assert d["max"] == max(win)
+        assert d["mean"] == pytest.approx(sum(win) / len(win), abs=1e-3)
+        assert len(stats._min_q) <= 10 and len(stats._max_q) <= 10
+
+
+def test_ewma_and_trend():
+    stats = MetricStats()
+    stats.add(10)
+    assert stats.ewma == 10
+    assert stats.trend()["direction"] == "flat"
+    for _ in range(20):
+        stats.add(50)
+    assert 10 < stats.ewma <= 50
+    assert stats.trend()["direction"] == "up"
+
+
+def test_ingest_skips_bad_values_without_partial_update():
+    engine = LiveStatsEngine()
+    assert engine.ingest({"temperature": 20, "pm2_5": "abc", "pm10": float("nan"), "tvoc": None}, "dev1") is None
+    snap = engine.snapshot("dev1")["dev1"]
+    assert set(snap) == {"temperature"}
+
+
+def test_ingest_evicts_least_recently_seen_device(monkeypatch):
+    monkeypatch.setattr(live_stats, "MAX_DEVICES", 2)
+    engine = LiveStatsEngine()
+    assert engine.ingest({"pm2_5": 1}, "a") is None
+    assert engine.ingest({"pm2_5": 1}, "b") is None
+    assert engine.ingest({"pm2_5": 2}, "a") is None  # a 최근 사용
+    assert engine.ingest({"pm2_5": 1}, "c") == "b"   # 새 장치는 항상 반영, 가장 오래된 b 제거
+    assert set(engine.snapshot()) == {"a", "c"}
+    assert engine.smoothed("c", "pm2_5") == 1
+
+
+def test_active_devices_ttl():
+    now = [0.0]
+    engine = LiveStatsEngine(clock=lambda: now[0])
+    engine.ingest({"pm2_5": 1}, "a")
+    now[0] = 100
+    engine.ingest({"pm2_5": 1}, "b")
+    now[0] = 150
+    assert sorted(engine.active_devices(60)) == ["b"]
+    assert sorted(engine.active_devices(200)) == ["a", "b"]
+
+
+def test_percentiles_are_lifetime():
+    stats = MetricStats(window_size=5)
+    for x in range(100):
+        stats.add(x)
+    d = stats.to_dict()
+    assert "percentiles" not in d
+    assert d["window"]["min"] == 95
+    # 백분위는 구간(95~99)이 아니라 전체 0~99 기준
+    assert d["lifetime_percentiles"]["p50"] == pytest.approx(49.5, abs=2)
+
+
+def test_valid_device_id():
+    assert valid_device_id("esp32-01")
+    assert not valid_device_id("")
+    assert not valid_device_id("a" * 33)
+    assert not valid_device_id("../x y")
+    assert not valid_device_id(123)
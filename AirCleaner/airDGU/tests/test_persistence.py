@@ -0,0 +1,150 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+import app as airdgu
+from app import AirKoreaData, EnvironmentScore, SensorData, db
+from live_stats import LiveStatsEngine
+from persistence import bulk_upsert, require_primary_key
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    monkeypatch.setattr(airdgu, "send_donguk_speed", lambda speed: {"ok": True, "status": 200, "text": "ok"})
+    monkeypatch.setattr(airdgu, "live_stats", LiveStatsEngine())
+    monkeypatch.setattr(airdgu, "_control_state", {"devices": {}, "speed": None})
+    with airdgu.app.app_context():
+        for model in (EnvironmentScore, SensorData, AirKoreaData):
+            db.session.query(model).delete()
+        db.session.commit()
+        yield
+        db.session.rollback()
+
+
+@pytest.fixture
+def sql_log(ctx):
+    """실행된 SQL 문과 커밋 횟수 기록"""
+    log = {"statements": [], "commits": 0}
+
+    def on_execute(conn, cursor, statement, params, context, executemany):
+        log["statements"].append(statement.split()[0].upper())
+
+    def on_commit(conn):
+        log["commits"] += 1
+
+    event.listen(db.engine, "before_cursor_execute", on_execute)
+    event.listen(db.engine, "commit", on_commit)
+    yield log
+    event.remove(db.engine, "before_cursor_execute", on_execute)
+    event.remove(db.engine, "commit", on_commit)
+
+
+def test_bulk_upsert_updates_existing_row(ctx):
+    ts = datetime(2026, 1, 1, 10, 0)
+    bulk_upsert(db.session, AirKoreaData, [{"timestamp": ts, "pm10_ug_m3_": 10, "pm10_category": 1}])
+    bulk_upsert(db.session, AirKoreaData, [
+        {"timestamp": ts, "pm10_ug_m3_": 55, "pm10_category": 2},
+        {"timestamp": datetime(2026, 1, 1, 11, 0), "pm10_ug_m3_": 20, "pm10_category": 1},
+    ])
+    db.session.commit()
+    rows = AirKoreaData.query.order_by(AirKoreaData.timestamp).all()
+    assert len(rows) == 2
+    assert float(rows[0].pm10_ug_m3_) == 55 and rows[0].pm10_category == 2
+
+
+def test_save_sensor_data_single_commit(sql_log):
+    rec, score = airdgu.save_sensor_data({"temperature": 21.5, "pm2_5": 20, "pm10": 40})
+    # sensor_data INSERT + 점수 INSERT, 재조회 SELECT 없이 커밋 1번
+    assert sql_log["statements"] == ["INSERT", "INSERT"]
+    assert sql_log["commits"] == 1
+    assert score == 2
+    stored = db.session.get(SensorData, rec.id)
+    assert [float(s.environmental_score) for s in stored.scores] == [2]
+
+
+def test_upload_statements_per_request(sql_log):
+    client = airdgu.app.test_client()
+    resp = client.post("/upload", json={"sensor_data": "21.5,40,400,0.1,20,40"})
+    assert resp.status_code == 201
+    assert sql_log["statements"].count("INSERT") == 2
+    assert "SELECT" not in sql_log["statements"]
+    assert sql_log["commits"] == 1
+
+
+def test_response_matches_stored_values(ctx):
+    client = airdgu.app.test_client()
+    resp = client.post("/api/sensor_data", json={"co2eq": "400", "pm2_5": 12.34567, "pm10": "30"})
+    assert resp.status_code == 201
+    body = resp.get_json()["sensor_data"]
+    assert body["co2eq"] == 400
+    assert body["pm2_5"] == 12.346
+    stored = db.session.get(SensorData, body["id"]).to_dict()
+    for key in ("co2eq", "pm2_5", "pm10"):
+        assert body[key] == stored[key]
+
+
+@pytest.mark.parametrize("field,value", [("pm2_5", "abc"), ("co2eq", "400.9"), ("tvoc", "inf")])
+def test_invalid_value_rejected(ctx, field, value):
+    client = airdgu.app.test_client()
+    resp = client.post("/api/sensor_data", json={"pm2_5": 10, "pm10": 20, field: value})
+    assert resp.status_code == 400
+    assert field in resp.get_json()["error"]
+    assert SensorData.query.count() == 0
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, pm10):
+        self.pm10 = pm10
+
+    def json(self):
+        item = {
+            "dataTime": "2026-01-01 10:00", "pm10Value": self.pm10, "pm25Value": "12",
+            "pm10Grade": "2", "pm25Grade": "1", "o3Value": "0.03", "no2Value": "-",
+            "coValue": "0.4", "so2Value": "0.003",
+        }
+        return {"response": {"header": {"resultCode": "00"}, "body": {"items": [item]}}}
+
+
+def test_fetch_airkorea_twice_same_time(ctx, monkeypatch):
+    responses = iter([_FakeResponse("40"), _FakeResponse("45")])
+    monkeypatch.setattr(airdgu.requests, "get", lambda *a, **kw: next(responses))
+    airdgu.fetch_and_save_airkorea_data()
+    airdgu.fetch_and_save_airkorea_data()
+    rows = AirKoreaData.query.all()
+    assert len(rows) == 1
+    assert float(rows[0].pm10_ug_m3_) == 45
+    assert rows[0].no2_ppm_ is None
+
+
+def test_require_primary_key():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE air_korea_data (timestamp DATETIME, pm10_ug_m3_ NUMERIC)"))
+        conn.execute(text("CREATE TABLE ok (timestamp DATETIME PRIMARY KEY)"))
+    with pytest.raises(RuntimeError):
+        require_primary_key(engine, "air_korea_data", ["timestamp"])
+    require_primary_key(engine, "ok", ["timestamp"])
+
+
+def test_import_does_not_connect(tmp_path):
+    # 접속 불가 DB 주소여도 import는 성공, init_db()에서만 실패
+    airdgu_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, types; sys.modules.setdefault('naomkey', types.SimpleNamespace(DONGUK_KEY='x'))\n"
+        "import app\n"
+        "try:\n"
+        "    app.init_db()\n"
+        "except Exception:\n"
+        "    print('init_db failed')\n"
+    )
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path}/missing/dir/x.db")
+    out = subprocess.run([sys.executable, "-c", code], cwd=airdgu_dir, env=env,
+                         capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert "init_db failed" in out.stdout